@@ -1,7 +1,37 @@
+from collections import defaultdict
+from functools import lru_cache
 from typing import Optional
 
 import frappe
 
+ITEM_GROUPS = {
+    "destek_saci": ["pvc destek sacları"],
+    "satis": ["pvc satış", "satış stoğu"],
+    "yardimci_profil": ["pvc hat1 yardımcı profiller", "pvc hat2 yardımcı profiller"],
+    "panel": ["pvc hat1 paneller"],
+    "ana_profil": ["pvc hat1 ana profiller", "pvc hat2 ana profiller"],
+    "cita": ["pvc hat1 çıtalar"],
+    "aksesuar": ["pvc hat1 aksesuarlar", "pvc hat2 aksesuarlar"],
+    "orta_kayit": ["pvc hat1 ortakayıt bağlantı", "pvc hat2 ortakayıt bağlantı"],
+    "fitil_ve_esik": ["pvc hat1 fitil ve eşikler"],
+    "cam_unite": [
+        "cam ünite",
+        "cam üniteler",
+        "cam ünite üretim",
+        "cam ünite malzemeler",
+        "cam ünite kimyasallar",
+        "cam ünite karolaj çıtaları",
+        "cam ünite ara çıtalar",
+        "tek camlar",
+        "camlar",
+    ],
+    "ortak_fitil": ["ortak fitiller"],
+    "ortak_vida": ["ortak vidalar"],
+    "ortak_izolasyon": ["ortak izolasyon"],
+    "pvc_kollari": ["pvc kolları"],
+    "aluminyum_dograma_sistemi": ["alüminyum doğrama sistem aks"],
+}
+
 
 @frappe.whitelist()
 def get_poz_data(
@@ -74,48 +104,23 @@ def get_poz_data(
 
 def group_bom_items_by_category(bom_doc):
     """Group BOM Items by their item_group."""
-    ITEM_GROUPS = {
-        "destek_saci": ["pvc destek sacları"],
-        "satis": ["pvc satış", "satış stoğu"],
-        "yardimci_profil": ["pvc hat1 yardımcı profiller", "pvc hat2 yardımcı profiller"],
-        "panel": ["pvc hat1 paneller"],
-        "ana_profil": ["pvc hat1 ana profiller", "pvc hat2 ana profiller"],
-        "cita": ["pvc hat1 çıtalar"],
-        "aksesuar": ["pvc hat1 aksesuarlar", "pvc hat2 aksesuarlar"],
-        "orta_kayit": ["pvc hat1 ortakayıt bağlantı", "pvc hat2 ortakayıt bağlantı"],
-        "fitil_ve_esik": ["pvc hat1 fitil ve eşikler"],
-        "cam_unite": [
-            "cam ünite",
-            "cam üniteler",
-            "cam ünite üretim",
-            "cam ünite malzemeler",
-            "cam ünite kimyasallar",
-            "cam ünite karolaj çıtaları",
-            "cam ünite ara çıtalar",
-            "tek camlar",
-            "camlar",
-        ],
-        "ortak_fitil": ["ortak fitiller"],
-        "ortak_vida": ["ortak vidalar"],
-        "ortak_izolasyon": ["ortak izolasyon"],
-        "pvc_kollari": ["pvc kolları"],
-        "aluminyum_dograma_sistemi": ["alüminyum doğrama sistem aks"],
-    }
-    grouped_items = {}
+    item_codes = list({item.item_code for item in bom_doc.items})
+    item_groups = dict(
+        frappe.get_all(
+            "Item",
+            filters={"name": ["in", item_codes]},
+            fields=["name", "item_group"],
+            as_list=1,
+        )
+        if item_codes
+        else []
+    )
+    grouped_items = defaultdict(list)
 
     for item in bom_doc.items:
-        item_group = frappe.get_value("Item", item.item_code, "item_group")
-        normalized_group = item_group.lower()
-
-        target_group = None
-        for group_key, group_values in ITEM_GROUPS.items():
-            if any(value in normalized_group for value in group_values):
-                target_group = group_key
-                break
+        target_group = _resolve_item_group(item_groups.get(item.item_code))
 
         if target_group:
-            if target_group not in grouped_items:
-                grouped_items[target_group] = []
             grouped_items[target_group].append(
                 {
                     "item_code": item.item_code,
@@ -125,7 +130,19 @@ def group_bom_items_by_category(bom_doc):
                 }
             )
 
-    return grouped_items
+    return dict(grouped_items)
+
+
+@lru_cache(maxsize=None)
+def _resolve_item_group(item_group: Optional[str]) -> Optional[str]:
+    """Map an Item Group name to its ITEM_GROUPS key."""
+    normalized_group = (item_group or "").lower()
+
+    for group_key, group_values in ITEM_GROUPS.items():
+        if any(value in normalized_group for value in group_values):
+            return group_key
+
+    return None
 
 
 def get_latest_default_bom(base_name: str):
@@ -1,4 +1,5 @@
 import json
+from collections import defaultdict
 from typing import Any, Optional
 
 import frappe
@@ -198,15 +199,13 @@ def get_tesdetay(
         raise InvalidBarcodeError(f"No TesDetay found for barcode: {barcode}")
 
     # Group by siparis_no, poz_no, and sanal_adet
-    grouped = {}
+    grouped = defaultdict(list)
     for tesdetay in all_data:
         key = (
             tesdetay.get("siparis_no"),
             tesdetay.get("poz_no"),
             tesdetay.get("sanal_adet"),
         )
-        if key not in grouped:
-            grouped[key] = []
         grouped[key].append(tesdetay)
 
     # Try to pick a preferred TesDetay across all groups (IN PROGRESS > PENDING)
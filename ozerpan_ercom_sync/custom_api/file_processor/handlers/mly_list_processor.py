@@ -232,10 +232,42 @@ class MLYListProcessor(ExcelProcessorInterface):
 
             print(f"Processing {len(glasses)} items in Camlar group")
 
+            glass_stock_codes = (
+                list({code.lstrip("#") for code in glasses["Stok Kodu"]})
+                if not glasses.empty
+                else []
+            )
+            cam_recipes = set(
+                frappe.get_all(
+                    "Cam Recipe",
+                    filters={"name": ["in", glass_stock_codes]},
+                    pluck="name",
+                )
+                if glass_stock_codes
+                else []
+            )
+            profile_types = set(
+                frappe.get_all(
+                    "Profile Type",
+                    filters={"name": ["in", glass_stock_codes]},
+                    pluck="name",
+                )
+                if glass_stock_codes
+                else []
+            )
+
             for idx, row in glasses.iterrows():
                 stock_code = row["Stok Kodu"].lstrip("#")
-                is_cam_recipe = frappe.db.exists("Cam Recipe", stock_code)
-                is_profile_type = frappe.db.exists("Profile Type", stock_code)
+                # Exact matches are settled by the prefetched names; anything
+                # else (case, accents, trailing spaces) goes to frappe.db.exists
+                # so the database collation decides as before
+                is_cam_recipe = stock_code in cam_recipes or bool(
+                    frappe.db.exists("Cam Recipe", stock_code)
+                )
+                is_profile_type = not is_cam_recipe and (
+                    stock_code in profile_types
+                    or bool(frappe.db.exists("Profile Type", stock_code))
+                )
 
                 if is_cam_recipe:
                     # This is a real glass item
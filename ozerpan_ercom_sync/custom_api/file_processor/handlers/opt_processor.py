@@ -156,10 +156,10 @@ class OPTProcessor(ExcelProcessorInterface):
         """
         try:
             with get_mysql_connection() as connection:
-                cursor = connection.cursor()
-                query = f"SELECT MAKINA FROM dbtes WHERE OTONO = '{opt_no}'"
-                cursor.execute(query)
-                machines = cursor.fetchall()
+                with connection.cursor() as cursor:
+                    query = f"SELECT MAKINA FROM dbtes WHERE OTONO = '{opt_no}'"
+                    cursor.execute(query)
+                    machines = cursor.fetchall()
                 machine = machines[0] if machines else {}
                 return machine.get("MAKINA", 0)
         except Exception as e:
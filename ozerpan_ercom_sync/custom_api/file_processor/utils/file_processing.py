@@ -107,7 +107,7 @@ class FileSet(Enum):
     SET_B = "set_b"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FileInfo:
     """Information about a file to be processed"""
 
@@ -9,15 +9,20 @@ def on_update(doc, method):
         is_pvc = False if len(parts) > 2 else True
 
         if is_pvc:
-            bom = frappe.get_doc("BOM", item.bom_no)
-            kkt_operation = next(
-                (o for o in bom.operations if o.operation == "Kaynak Köşe Temizleme"),
-                None,
+            kkt_operation = frappe.db.get_value(
+                "BOM Operation",
+                {
+                    "parent": item.bom_no,
+                    "parenttype": "BOM",
+                    "operation": "Kaynak Köşe Temizleme",
+                },
+                "name",
+                order_by="idx asc",
             )
             if kkt_operation:
                 frappe.db.set_value(
                     "BOM Operation",
-                    kkt_operation.name,
+                    kkt_operation,
                     "workstation",
                     item.custom_workstation,
                 )
@@ -1,9 +1,14 @@
 # Copyright (c) 2025, juniustech and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
 
 class TesDetayOperationStatus(Document):
 	pass
+
+
+def on_doctype_update():
+	# bulk_update_operation_status matches rows on (parent, job_card_ref)
+	frappe.db.add_index("TesDetay Operation Status", ["parent", "job_card_ref"])
@@ -4,4 +4,11 @@
 # the naming convention test_*.py and can be run individually or collectively
 # through the Frappe bench command:
 #
-# bench run-tests --app ozerpan_ercom_sync
\ No newline at end of file
+# bench run-tests --app ozerpan_ercom_sync
+#
+# The tests do not share state between methods: fixtures live in per-class
+# temporary directories, shared inputs are immutable, and mocks patched once
+# per class are reset in setUp. They can therefore also be spread across CPU
+# cores with pytest-xdist, a dev dependency of this app, when it is installed:
+#
+# pytest -n auto --dist=loadfile ozerpan_ercom_sync/tests
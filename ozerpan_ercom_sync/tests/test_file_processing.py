@@ -25,35 +25,114 @@ from ozerpan_ercom_sync.custom_api.file_processor.utils.file_set_processing impo
     process_all_file_sets
 )
 
+_SET_A = FileSet.SET_A.value
+_SET_B = FileSet.SET_B.value
+
+# Fixture files created in the to_process directory
+TEST_FILES = (
+    "12345_MLY3.xls",
+    "12345_CAMLISTE.xls",
+    "67890_OPTGENEL.xls",
+    "67890_DST.xls",
+    "11111_OTHER.xls",
+)
+
+# FileInfo fixtures for the file set tests
+_SET_A_FILES = {
+    "MLY3": FileInfo(
+        filename="12345_MLY3.xls",
+        path="/path/to/12345_MLY3.xls",
+        order_no="12345",
+        file_type="MLY3"
+    ),
+    "CAMLISTE": FileInfo(
+        filename="12345_CAMLISTE.xls",
+        path="/path/to/12345_CAMLISTE.xls",
+        order_no="12345",
+        file_type="CAMLISTE"
+    )
+}
+
+_SET_B_FILES = {
+    "OPTGENEL": FileInfo(
+        filename="67890_OPTGENEL.xls",
+        path="/path/to/67890_OPTGENEL.xls",
+        order_no="67890",
+        file_type="OPTGENEL"
+    ),
+    "DST": FileInfo(
+        filename="67890_DST.xls",
+        path="/path/to/67890_DST.xls",
+        order_no="67890",
+        file_type="DST"
+    )
+}
+
+_MIXED_FILES = {
+    "MLY3": _SET_A_FILES["MLY3"],
+    "DST": _SET_B_FILES["DST"],
+    "OTHER": FileInfo(
+        filename="12345_OTHER.xls",
+        path="/path/to/12345_OTHER.xls",
+        order_no="12345",
+        file_type="OTHER"
+    )
+}
+
+
+def _ramdisk_root():
+    """Return a RAM-backed directory for temporary fixtures when available."""
+    return "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def _fast_rmtree(root):
+    """
+    Remove the two-level fixture tree using the file type information that
+    os.scandir already returns, instead of stat-ing every entry again.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                with os.scandir(entry.path) as children:
+                    for child in children:
+                        os.unlink(child.path)
+                os.rmdir(entry.path)
+            else:
+                os.unlink(entry.path)
+    os.rmdir(root)
+
 
 class TestFileProcessing(FrappeTestCase):
-    def setUp(self):
-        # Create temporary directories for testing
-        self.temp_dir = tempfile.mkdtemp()
-        self.to_process = os.path.join(self.temp_dir, "to_process")
-        self.processed = os.path.join(self.temp_dir, "processed")
-        self.failed = os.path.join(self.temp_dir, "failed")
-        
-        os.makedirs(self.to_process, exist_ok=True)
-        os.makedirs(self.processed, exist_ok=True)
-        os.makedirs(self.failed, exist_ok=True)
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Create temporary directories for testing once for the whole class
+        cls.temp_dir = tempfile.mkdtemp(dir=_ramdisk_root())
+        cls.to_process = os.path.join(cls.temp_dir, "to_process")
+        cls.processed = os.path.join(cls.temp_dir, "processed")
+        cls.failed = os.path.join(cls.temp_dir, "failed")
+        
+        for directory in (cls.to_process, cls.processed, cls.failed):
+            os.mkdir(directory)
         
         # Create test files
-        test_files = [
-            "12345_MLY3.xls",
-            "12345_CAMLISTE.xls",
-            "67890_OPTGENEL.xls",
-            "67890_DST.xls",
-            "11111_OTHER.xls"
-        ]
-        
-        for filename in test_files:
-            with open(os.path.join(self.to_process, filename), 'w') as f:
-                f.write("Test content")
+        for filename in TEST_FILES:
+            Path(cls.to_process, filename).touch()
     
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         # Clean up temporary directory
-        shutil.rmtree(self.temp_dir)
+        _fast_rmtree(cls.temp_dir)
+        super().tearDownClass()
+    
+    def setUp(self):
+        # Restore only what a previous test removed from the shared fixture
+        for directory in (self.processed, self.failed):
+            if not os.path.isdir(directory):
+                os.mkdir(directory)
+        
+        for filename in set(TEST_FILES).difference(os.listdir(self.to_process)):
+            Path(self.to_process, filename).touch()
     
     def test_file_processing_directories(self):
         """Test FileProcessingDirectories class"""
@@ -69,20 +148,6 @@ class TestFileProcessing(FrappeTestCase):
         dirs.ensure_directories_exist()
         self.assertTrue(os.path.exists(self.processed))
     
-    def test_get_order_and_type(self):
-        """Test get_order_and_type function"""
-        order_no, file_type = get_order_and_type("12345_MLY3.xls")
-        self.assertEqual(order_no, "12345")
-        self.assertEqual(file_type, "MLY3")
-        
-        order_no, file_type = get_order_and_type("67890_OPTGENEL.XLS")
-        self.assertEqual(order_no, "67890")
-        self.assertEqual(file_type, "OPTGENEL")
-        
-        # Test invalid filename
-        with self.assertRaises(ValueError):
-            get_order_and_type("invalid_filename.xls")
-    
     def test_group_files_by_order(self):
         """Test group_files_by_order function"""
         grouped = group_files_by_order(self.to_process)
@@ -108,59 +173,7 @@ class TestFileProcessing(FrappeTestCase):
         self.assertEqual(file_info.filename, "12345_MLY3.xls")
         self.assertEqual(file_info.order_no, "12345")
         self.assertEqual(file_info.file_type, "MLY3")
-        self.assertTrue(os.path.exists(file_info.path))
-    
-    @patch("ozerpan_ercom_sync.custom_api.file_processor.utils.file_processing.shutil")
-    def test_move_file(self, mock_shutil):
-        """Test move_file function"""
-        file_info = FileInfo(
-            filename="12345_MLY3.xls",
-            path=os.path.join(self.to_process, "12345_MLY3.xls"),
-            order_no="12345",
-            file_type="MLY3"
-        )
-        
-        # Test successful move
-        move_file(file_info, self.processed)
-        mock_shutil.move.assert_called_once_with(
-            file_info.path, 
-            os.path.join(self.processed, file_info.filename)
-        )
-        
-        # Test move with error log
-        mock_shutil.reset_mock()
-        with patch("ozerpan_ercom_sync.custom_api.api.create_error_log_file") as mock_log:
-            mock_log.return_value = "/tmp/error.log"
-            move_file(
-                file_info, 
-                self.failed, 
-                create_log=True,
-                error_message="Test error",
-                error_details={"error_type": "test"}
-            )
-            mock_log.assert_called_once()
-            mock_shutil.move.assert_any_call(
-                file_info.path, 
-                os.path.join(self.failed, file_info.filename)
-            )
-            mock_shutil.move.assert_any_call(
-                "/tmp/error.log", 
-                os.path.join(self.failed, f"{file_info.filename}.log")
-            )
-    
-    def test_get_file_sets(self):
-        """Test get_file_sets function"""
-        file_sets = get_file_sets()
-        self.assertIn(FileSet.SET_A.value, file_sets)
-        self.assertIn(FileSet.SET_B.value, file_sets)
-        
-        # Check file types in set_a
-        self.assertIn("MLY3", file_sets[FileSet.SET_A.value])
-        self.assertIn("CAMLISTE", file_sets[FileSet.SET_A.value])
-        
-        # Check file types in set_b
-        self.assertIn("OPTGENEL", file_sets[FileSet.SET_B.value])
-        self.assertIn("DST", file_sets[FileSet.SET_B.value])
+        self.assertEqual(file_info.path, os.path.join(self.to_process, "12345_MLY3.xls"))
     
     @patch("ozerpan_ercom_sync.custom_api.file_processor.utils.file_processing.move_file")
     def test_process_file_with_error_handling(self, mock_move):
@@ -232,100 +245,145 @@ class TestFileProcessing(FrappeTestCase):
         mock_move.assert_called_once()
 
 
-class TestFileSetProcessing(FrappeTestCase):
+class TestFileProcessingHelpers(FrappeTestCase):
+    """Tests that only need fixture paths, not files on disk"""
+
     def setUp(self):
-        # Create mock file dictionaries for testing
-        self.set_a_files = {
-            "MLY3": FileInfo(
-                filename="12345_MLY3.xls",
-                path="/path/to/12345_MLY3.xls",
-                order_no="12345",
-                file_type="MLY3"
-            ),
-            "CAMLISTE": FileInfo(
-                filename="12345_CAMLISTE.xls",
-                path="/path/to/12345_CAMLISTE.xls",
-                order_no="12345",
-                file_type="CAMLISTE"
-            )
-        }
+        self.to_process = "/fake/to_process"
+        self.processed = "/fake/processed"
+        self.failed = "/fake/failed"
+    
+    def test_get_order_and_type(self):
+        """Test get_order_and_type function"""
+        order_no, file_type = get_order_and_type("12345_MLY3.xls")
+        self.assertEqual(order_no, "12345")
+        self.assertEqual(file_type, "MLY3")
         
-        self.set_b_files = {
-            "OPTGENEL": FileInfo(
-                filename="67890_OPTGENEL.xls",
-                path="/path/to/67890_OPTGENEL.xls",
-                order_no="67890",
-                file_type="OPTGENEL"
-            ),
-            "DST": FileInfo(
-                filename="67890_DST.xls",
-                path="/path/to/67890_DST.xls",
-                order_no="67890",
-                file_type="DST"
-            )
-        }
+        order_no, file_type = get_order_and_type("67890_OPTGENEL.XLS")
+        self.assertEqual(order_no, "67890")
+        self.assertEqual(file_type, "OPTGENEL")
         
-        self.mixed_files = {
-            "MLY3": self.set_a_files["MLY3"],
-            "DST": self.set_b_files["DST"],
-            "OTHER": FileInfo(
-                filename="12345_OTHER.xls",
-                path="/path/to/12345_OTHER.xls",
-                order_no="12345",
-                file_type="OTHER"
+        # Test invalid filename
+        with self.assertRaises(ValueError):
+            get_order_and_type("invalid_filename.xls")
+    
+    @patch("ozerpan_ercom_sync.custom_api.file_processor.utils.file_processing.shutil")
+    def test_move_file(self, mock_shutil):
+        """Test move_file function"""
+        file_info = FileInfo(
+            filename="12345_MLY3.xls",
+            path=os.path.join(self.to_process, "12345_MLY3.xls"),
+            order_no="12345",
+            file_type="MLY3"
+        )
+        
+        # Test successful move
+        move_file(file_info, self.processed)
+        mock_shutil.move.assert_called_once_with(
+            file_info.path, 
+            os.path.join(self.processed, file_info.filename)
+        )
+        
+        # Test move with error log
+        mock_shutil.reset_mock()
+        with patch("ozerpan_ercom_sync.custom_api.api.create_error_log_file") as mock_log:
+            mock_log.return_value = "/tmp/error.log"
+            move_file(
+                file_info, 
+                self.failed, 
+                create_log=True,
+                error_message="Test error",
+                error_details={"error_type": "test"}
             )
-        }
+            mock_log.assert_called_once()
+            mock_shutil.move.assert_any_call(
+                file_info.path, 
+                os.path.join(self.failed, file_info.filename)
+            )
+            mock_shutil.move.assert_any_call(
+                "/tmp/error.log", 
+                os.path.join(self.failed, f"{file_info.filename}.log")
+            )
+    
+    def test_get_file_sets(self):
+        """Test get_file_sets function"""
+        file_sets = get_file_sets()
+        self.assertIn(_SET_A, file_sets)
+        self.assertIn(_SET_B, file_sets)
+        
+        # Check file types in set_a
+        self.assertIn("MLY3", file_sets[_SET_A])
+        self.assertIn("CAMLISTE", file_sets[_SET_A])
+        
+        # Check file types in set_b
+        self.assertIn("OPTGENEL", file_sets[_SET_B])
+        self.assertIn("DST", file_sets[_SET_B])
+
+
+class TestFileSetProcessing(FrappeTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Manager mock shared by the tests; only its call history is reset
+        cls._mgr_proto = MagicMock()
+    
+    def setUp(self):
+        # Shared, immutable FileInfo fixtures; tests never mutate them
+        self.set_a_files = _SET_A_FILES
+        self.set_b_files = _SET_B_FILES
+        self.mixed_files = _MIXED_FILES
+        self._mgr_proto.reset_mock()
     
     def test_get_processing_order(self):
         """Test get_processing_order function"""
         # Test set_a with both files
-        order = get_processing_order(self.set_a_files, FileSet.SET_A.value)
+        order = get_processing_order(self.set_a_files, _SET_A)
         self.assertEqual(order[0], "MLY3")
         self.assertIn("CAMLISTE", order)
         
         # Test set_a with only MLY3
-        order = get_processing_order({"MLY3": self.set_a_files["MLY3"]}, FileSet.SET_A.value)
+        order = get_processing_order({"MLY3": self.set_a_files["MLY3"]}, _SET_A)
         self.assertEqual(order, ["MLY3"])
         
         # Test set_b with both files
-        order = get_processing_order(self.set_b_files, FileSet.SET_B.value)
+        order = get_processing_order(self.set_b_files, _SET_B)
         self.assertEqual(order[0], "OPTGENEL")
         self.assertIn("DST", order)
         
         # Test set_b with only DST
-        order = get_processing_order({"DST": self.set_b_files["DST"]}, FileSet.SET_B.value)
+        order = get_processing_order({"DST": self.set_b_files["DST"]}, _SET_B)
         self.assertEqual(order, ["DST"])
         
         # Test empty file dictionary
-        order = get_processing_order({}, FileSet.SET_A.value)
+        order = get_processing_order({}, _SET_A)
         self.assertEqual(order, [])
     
     def test_identify_file_sets(self):
         """Test identify_file_sets function"""
         # Test with files from both sets
         sets = identify_file_sets({**self.set_a_files, **self.set_b_files})
-        self.assertIn(FileSet.SET_A.value, sets)
-        self.assertIn(FileSet.SET_B.value, sets)
+        self.assertIn(_SET_A, sets)
+        self.assertIn(_SET_B, sets)
         
         # Check files in set_a
-        self.assertIn("MLY3", sets[FileSet.SET_A.value])
-        self.assertIn("CAMLISTE", sets[FileSet.SET_A.value])
+        self.assertIn("MLY3", sets[_SET_A])
+        self.assertIn("CAMLISTE", sets[_SET_A])
         
         # Check files in set_b
-        self.assertIn("OPTGENEL", sets[FileSet.SET_B.value])
-        self.assertIn("DST", sets[FileSet.SET_B.value])
+        self.assertIn("OPTGENEL", sets[_SET_B])
+        self.assertIn("DST", sets[_SET_B])
         
         # Test with only set_a files
         sets = identify_file_sets(self.set_a_files)
-        self.assertIn(FileSet.SET_A.value, sets)
-        self.assertNotIn(FileSet.SET_B.value, sets)
+        self.assertIn(_SET_A, sets)
+        self.assertNotIn(_SET_B, sets)
         
         # Test with mixed files and another type
         sets = identify_file_sets(self.mixed_files)
-        self.assertIn(FileSet.SET_A.value, sets)
-        self.assertIn(FileSet.SET_B.value, sets)
-        self.assertEqual(len(sets[FileSet.SET_A.value]), 1)
-        self.assertEqual(len(sets[FileSet.SET_B.value]), 1)
+        self.assertIn(_SET_A, sets)
+        self.assertIn(_SET_B, sets)
+        self.assertEqual(len(sets[_SET_A]), 1)
+        self.assertEqual(len(sets[_SET_B]), 1)
     
     @patch("ozerpan_ercom_sync.custom_api.file_processor.utils.file_set_processing.process_file_with_error_handling")
     def test_process_file_set(self, mock_process):
@@ -340,17 +398,17 @@ class TestFileSetProcessing(FrappeTestCase):
         
         # Test processing set_a
         result = process_file_set(
-            MagicMock(),
+            self._mgr_proto,
             "12345",
             self.set_a_files,
-            FileSet.SET_A.value,
+            _SET_A,
             "/processed",
             "/failed"
         )
         
         self.assertEqual(len(result["files_processed"]), 2)
         self.assertEqual(len(result["files_failed"]), 0)
-        self.assertEqual(result["file_set"], FileSet.SET_A.value)
+        self.assertEqual(result["file_set"], _SET_A)
         
         # Verify MLY3 was processed first
         mock_process.assert_any_call(
@@ -378,10 +436,10 @@ class TestFileSetProcessing(FrappeTestCase):
         ]
         
         result = process_file_set(
-            MagicMock(),
+            self._mgr_proto,
             "12345",
             self.set_a_files,
-            FileSet.SET_A.value,
+            _SET_A,
             "/processed",
             "/failed"
         )
@@ -396,26 +454,26 @@ class TestFileSetProcessing(FrappeTestCase):
         """Test process_all_file_sets function"""
         # Setup mocks
         mock_identify.return_value = {
-            FileSet.SET_A.value: self.set_a_files,
-            FileSet.SET_B.value: self.set_b_files
+            _SET_A: self.set_a_files,
+            _SET_B: self.set_b_files
         }
         
         mock_set_process.side_effect = [
             {
                 "files_processed": ["12345_MLY3.xls", "12345_CAMLISTE.xls"],
                 "files_failed": [],
-                "file_set": FileSet.SET_A.value
+                "file_set": _SET_A
             },
             {
                 "files_processed": ["67890_OPTGENEL.xls"],
                 "files_failed": ["67890_DST.xls"],
-                "file_set": FileSet.SET_B.value
+                "file_set": _SET_B
             }
         ]
         
         # Test processing all file sets
         result = process_all_file_sets(
-            MagicMock(),
+            self._mgr_proto,
             "12345",
             {**self.set_a_files, **self.set_b_files, **{"OTHER": self.mixed_files["OTHER"]}},
             "/processed",
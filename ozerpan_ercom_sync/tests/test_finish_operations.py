@@ -1,49 +1,281 @@
-import os
-import sys
 import unittest
-from unittest.mock import Mock, patch
+from dataclasses import dataclass, field
+from types import MappingProxyType, SimpleNamespace
+from typing import Callable, Mapping, Optional
+from unittest.mock import DEFAULT, Mock, patch
 
-# Add the app path to sys.path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+from ozerpan_ercom_sync.custom_api.barcode_reader.constants import BarcodeStatus
 
-from ozerpan_ercom_sync.custom_api.api import (
-    _complete_job_with_time_logs,
-    finish_with_previous_operations,
+# api module attributes patched for every test in this module
+PATCHED_API_NAMES = (
+    "frappe",
+    "read_barcode",
+    "save_with_retry",
+    "update_job_card_status",
+    "submit_job_card",
+    "is_job_fully_complete",
+    "_complete_job_with_time_logs",
+    "bulk_update_operation_status",
+)
+
+_BARCODE = "TEST123456"
+_JOB1 = "JOB-001"
+_JOB2 = "JOB-002"
+_JOB_NAME = "JOB-003"
+_KAYNAK = "Kaynak"
+_KANAT = "Kanat Hazırlık"
+
+_IN_PROGRESS = BarcodeStatus.IN_PROGRESS.value
+_PENDING = BarcodeStatus.PENDING.value
+
+# read_barcode results shared by the tests below. The api only mutates the
+# operations on a sequence error, which none of these trigger; the success
+# result gets completed_previous_operations added, so pass a dict() copy.
+_UNFINISHED_OPS_KAYNAK_WIP = MappingProxyType(
+    {
+        "status": "error",
+        "error_type": "unfinished operations",
+        "unfinished_operations": (
+            MappingProxyType(
+                {
+                    "name": _KAYNAK,
+                    "job_card": _JOB_NAME,
+                    "status": "Work In Progress",
+                    "is_corrective": False,
+                }
+            ),
+        ),
+    }
+)
+_UNFINISHED_OPS_KAYNAK_MISSING = MappingProxyType(
+    {
+        "status": "error",
+        "error_type": "unfinished operations",
+        "unfinished_operations": (
+            MappingProxyType(
+                {
+                    "name": _KAYNAK,
+                    "job_card": "MISSING-JOB",
+                    "status": "Missing",
+                    "is_corrective": False,
+                }
+            ),
+        ),
+    }
+)
+_UNFINISHED_OPS_KAYNAK_COMPLETED = MappingProxyType(
+    {
+        "status": "error",
+        "error_type": "unfinished operations",
+        "unfinished_operations": (
+            MappingProxyType(
+                {
+                    "name": _KAYNAK,
+                    "job_card": _JOB_NAME,
+                    "status": "Completed",
+                    "is_corrective": False,
+                }
+            ),
+        ),
+    }
+)
+# Unfinished operations with mixed submission states
+_UNFINISHED_OPS_MIXED_SUBMISSION = MappingProxyType(
+    {
+        "status": "error",
+        "error_type": "unfinished operations",
+        "unfinished_operations": (
+            MappingProxyType(
+                {
+                    "name": _KAYNAK,
+                    "job_card": _JOB1,
+                    "status": "Completed",
+                    "is_corrective": False,
+                    "docstatus": 1,  # Already submitted
+                    "operation_status": "Completed",
+                }
+            ),
+            MappingProxyType(
+                {
+                    "name": _KANAT,
+                    "job_card": _JOB2,
+                    "status": "Completed (Not Submitted)",
+                    "is_corrective": False,
+                    "docstatus": 0,  # Not submitted
+                    "operation_status": "Completed",
+                }
+            ),
+        ),
+    }
+)
+_SUCCESS_RESULT = MappingProxyType(
+    {"status": "completed", "message": "Quality check completed"}
+)
+
+
+@dataclass(frozen=True, slots=True)
+class FakeBarcode:
+    """Read-only stand-in for a Job Card barcode row"""
+
+    barcode: str
+    tesdetay_ref: str
+    status: str
+    model: str
+
+
+# Barcode rows are only read by the api, so the same rows serve every test
+_IN_PROGRESS_ROW = FakeBarcode(
+    barcode=_BARCODE, tesdetay_ref="TES-001", status=_IN_PROGRESS, model="KASA"
+)
+_PENDING_ROW = FakeBarcode(
+    barcode="TEST123457", tesdetay_ref="TES-002", status=_PENDING, model="KASA"
+)
+
+
+@dataclass(slots=True)
+class FakeJobCard:
+    """Attribute-only stand-in for a Job Card document
+
+    Slots play the part of spec_set: the api may only read or write the
+    Job Card fields declared here.
+    """
+
+    name: str
+    docstatus: int = 0
+    status: str = "Work In Progress"
+    for_quantity: int = 0
+    total_completed_qty: int = 0
+    total_time_in_mins: float = 0
+    actual_end_date: Optional[str] = None
+    custom_barcodes: list = field(default_factory=list)
+    time_logs: list = field(default_factory=list)
+
+    def reload(self):
+        """Nothing to refresh; the api reloads job cards after saving"""
+
+
+def _make_job_card(**kw):
+    """Build a draft job card for 10 units, overriding fields from kw"""
+    return FakeJobCard(**{"name": _JOB_NAME, "for_quantity": 10, **kw})
+
+
+def _dict_side_effect(mapping):
+    """Mock side_effect that looks up the last positional argument in mapping"""
+    return lambda *args, **kwargs: mapping[args[-1]]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One unfinished-operations setup for finish_with_previous_operations"""
+
+    name: str
+    unfinished: Mapping
+    job_card: Optional[Callable[[], FakeJobCard]] = None
+    fully_complete: bool = True
+    expected_completed: Optional[int] = None
+    expects_submit: bool = False
+    expects_on_hold: bool = False
+    verify_calls: bool = False
+
+
+# Job cards are built per scenario since the api updates their status
+SCENARIOS = (
+    Scenario(
+        name="completes and submits draft job card",
+        unfinished=_UNFINISHED_OPS_KAYNAK_WIP,
+        job_card=lambda: _make_job_card(
+            custom_barcodes=[_IN_PROGRESS_ROW, _PENDING_ROW]
+        ),
+        expected_completed=1,
+        expects_submit=True,
+        verify_calls=True,
+    ),
+    Scenario(
+        name="holds job card that is not fully complete",
+        unfinished=_UNFINISHED_OPS_KAYNAK_WIP,
+        job_card=lambda: _make_job_card(
+            total_completed_qty=5,
+            time_logs=[SimpleNamespace(completed_qty=5)],
+            custom_barcodes=[_IN_PROGRESS_ROW],
+        ),
+        fully_complete=False,
+        expects_on_hold=True,
+    ),
+    Scenario(
+        name="skips missing job card",
+        unfinished=_UNFINISHED_OPS_KAYNAK_MISSING,
+        expected_completed=0,
+    ),
+    Scenario(
+        name="skips already submitted job card",
+        unfinished=_UNFINISHED_OPS_KAYNAK_COMPLETED,
+        job_card=lambda: _make_job_card(docstatus=1),
+        expected_completed=0,
+    ),
+    Scenario(
+        name="submits job card whose time logs cover the quantity",
+        unfinished=_UNFINISHED_OPS_KAYNAK_WIP,
+        job_card=lambda: _make_job_card(
+            total_completed_qty=10,
+            time_logs=[SimpleNamespace(completed_qty=10)],
+        ),
+        expects_submit=True,
+    ),
 )
-from ozerpan_ercom_sync.custom_api.barcode_reader.constants import BarcodeStatus
 
 
 class TestFinishWithPreviousOperations(unittest.TestCase):
     """Test cases for finish_with_previous_operations function"""
 
+    mock_barcode = _BARCODE
+    mock_employee = "EMP001"
+    mock_operation = "Kalite"
+    mock_quality_data = MappingProxyType({"overall_notes": "Test quality check"})
+
+    @classmethod
+    def setUpClass(cls):
+        """Import and patch the api module once for the whole class"""
+        # Imported here rather than at module level so that collecting the
+        # suite does not load the api and its frappe dependencies
+        from ozerpan_ercom_sync.custom_api import api
+
+        cls.api = api
+        # Keep the real helper, which is patched for the api's own callers
+        cls.complete_job_with_time_logs = staticmethod(api._complete_job_with_time_logs)
+        patcher = patch.multiple(
+            api,
+            **dict.fromkeys(PATCHED_API_NAMES, DEFAULT),
+        )
+        cls.api_mocks = SimpleNamespace(**patcher.start())
+        cls.addClassCleanup(patcher.stop)
+
     def setUp(self):
-        """Set up test fixtures"""
-        self.mock_barcode = "TEST123456"
-        self.mock_employee = "EMP001"
-        self.mock_operation = "Kalite"
-        self.mock_quality_data = {"overall_notes": "Test quality check"}
-
-    @patch("ozerpan_ercom_sync.custom_api.api.read_barcode")
-    def test_invalid_operation_parameter(self, mock_read_barcode):
+        """Clear calls and configured results left by the previous test"""
+        self._reset_api_mocks()
+
+    def _reset_api_mocks(self):
+        for mock in vars(self.api_mocks).values():
+            mock.reset_mock(return_value=True, side_effect=True)
+
+    def test_invalid_operation_parameter(self):
         """Test that invalid operation parameter returns error"""
-        result = finish_with_previous_operations(
+        result = self.api.finish_with_previous_operations(
             barcode=self.mock_barcode,
             employee=self.mock_employee,
             operation="InvalidOperation",
         )
 
-        self.assertEqual(result["status"], "error")
-        self.assertEqual(result["error_type"], "validation")
+        expected = {"status": "error", "error_type": "validation"}
+        self.assertLessEqual(expected.items(), result.items())
         self.assertIn("Invalid operation parameter", result["message"])
-        mock_read_barcode.assert_not_called()
+        self.api_mocks.read_barcode.assert_not_called()
 
-    @patch("ozerpan_ercom_sync.custom_api.api.read_barcode")
-    def test_no_unfinished_operations(self, mock_read_barcode):
+    def test_no_unfinished_operations(self):
         """Test when there are no unfinished operations"""
         expected_result = {"status": "success", "message": "Quality check completed"}
-        mock_read_barcode.return_value = expected_result
+        self.api_mocks.read_barcode.return_value = expected_result
 
-        result = finish_with_previous_operations(
+        result = self.api.finish_with_previous_operations(
             barcode=self.mock_barcode,
             employee=self.mock_employee,
             operation=self.mock_operation,
@@ -51,307 +283,150 @@ class TestFinishWithPreviousOperations(unittest.TestCase):
         )
 
         self.assertEqual(result, expected_result)
-        mock_read_barcode.assert_called_once()
-
-    @patch("ozerpan_ercom_sync.custom_api.api.frappe")
-    @patch("ozerpan_ercom_sync.custom_api.api.bulk_update_operation_status")
-    @patch("ozerpan_ercom_sync.custom_api.api._complete_job_with_time_logs")
-    @patch("ozerpan_ercom_sync.custom_api.api.is_job_fully_complete")
-    @patch("ozerpan_ercom_sync.custom_api.api.submit_job_card")
-    @patch("ozerpan_ercom_sync.custom_api.api.update_job_card_status")
-    @patch("ozerpan_ercom_sync.custom_api.api.save_with_retry")
-    @patch("ozerpan_ercom_sync.custom_api.api.read_barcode")
-    def test_complete_unfinished_operations_success(
-        self,
-        mock_read_barcode,
-        mock_save_with_retry,
-        mock_update_job_card_status,
-        mock_submit_job_card,
-        mock_is_job_fully_complete,
-        mock_complete_job_with_time_logs,
-        mock_bulk_update_operation_status,
-        mock_frappe,
-    ):
-        """Test successfully completing unfinished operations"""
-
-        # Mock unfinished operations response
-        unfinished_ops_result = {
-            "status": "error",
-            "error_type": "unfinished operations",
-            "unfinished_operations": [
-                {
-                    "name": "Kaynak",
-                    "job_card": "JOB-001",
-                    "status": "Work In Progress",
-                    "is_corrective": False,
-                }
-            ],
-        }
-
-        # Mock successful quality operation result
-        success_result = {"status": "completed", "message": "Quality check completed"}
-
-        # Set up read_barcode to return unfinished operations first, then success
-        mock_read_barcode.side_effect = [unfinished_ops_result, success_result]
-
-        # Mock job card document
-        mock_job_card = Mock()
-        mock_job_card.name = "JOB-001"
-        mock_job_card.docstatus = 0  # Draft
-        mock_job_card.status = "Work In Progress"
-        mock_job_card.for_quantity = 10
-        mock_job_card.total_completed_qty = 0
-        mock_job_card.custom_barcodes = [
-            Mock(
-                barcode="TEST123456",
-                tesdetay_ref="TES-001",
-                status=BarcodeStatus.IN_PROGRESS.value,
-                model="KASA",
-            ),
-            Mock(
-                barcode="TEST123457",
-                tesdetay_ref="TES-002",
-                status=BarcodeStatus.PENDING.value,
-                model="KASA",
-            ),
-        ]
-
-        mock_frappe.get_doc.return_value = mock_job_card
-        mock_is_job_fully_complete.return_value = True
+        self.api_mocks.read_barcode.assert_called_once()
+
+    def test_complete_unfinished_operations(self):
+        """Test completing unfinished operations for each scenario"""
+        for scenario in SCENARIOS:
+            with self.subTest(scenario.name):
+                self._reset_api_mocks()
+                self.api_mocks.read_barcode.side_effect = [
+                    scenario.unfinished,
+                    dict(_SUCCESS_RESULT),
+                ]
+                job_card = scenario.job_card() if scenario.job_card else None
+                if job_card is not None:
+                    self.api_mocks.frappe.get_doc.return_value = job_card
+                self.api_mocks.is_job_fully_complete.return_value = (
+                    scenario.fully_complete
+                )
+
+                result = self.api.finish_with_previous_operations(
+                    barcode=self.mock_barcode,
+                    employee=self.mock_employee,
+                    operation=self.mock_operation,
+                    quality_data=self.mock_quality_data,
+                )
+
+                self.assertEqual(result["status"], "completed")
+                if scenario.expected_completed is not None:
+                    self.assertEqual(
+                        len(result["completed_previous_operations"]),
+                        scenario.expected_completed,
+                    )
+                if scenario.expects_submit:
+                    self.api_mocks._complete_job_with_time_logs.assert_called_once_with(
+                        job_card, self.mock_employee
+                    )
+                    self.api_mocks.submit_job_card.assert_called_once_with(job_card)
+                if scenario.expects_on_hold:
+                    self.api_mocks.update_job_card_status.assert_called_with(
+                        job_card, "On Hold"
+                    )
+                    self.api_mocks.submit_job_card.assert_not_called()
+                if scenario.verify_calls:
+                    self.api_mocks.frappe.get_doc.assert_called_with(
+                        "Job Card", _JOB_NAME
+                    )
+                    self.api_mocks.bulk_update_operation_status.assert_called_once()
+                    self.api_mocks.is_job_fully_complete.assert_called_once_with(
+                        job_card
+                    )
+                    self.api_mocks.frappe.db.commit.assert_called_once()
 
-        result = finish_with_previous_operations(
-            barcode=self.mock_barcode,
-            employee=self.mock_employee,
-            operation=self.mock_operation,
-            quality_data=self.mock_quality_data,
-        )
+    def test_finish_with_previous_operations_skips_submitted(self):
+        """Test that finish_with_previous_operations skips already submitted job cards"""
 
-        # Verify the result
-        self.assertEqual(result["status"], "completed")
-        self.assertIn("completed_previous_operations", result)
-        self.assertEqual(len(result["completed_previous_operations"]), 1)
-
-        # Verify function calls
-        mock_frappe.get_doc.assert_called_with("Job Card", "JOB-001")
-        mock_bulk_update_operation_status.assert_called_once()
-        mock_complete_job_with_time_logs.assert_called_once_with(
-            mock_job_card, self.mock_employee
-        )
-        mock_is_job_fully_complete.assert_called_once_with(mock_job_card)
-        mock_submit_job_card.assert_called_once_with(mock_job_card)
-        mock_frappe.db.commit.assert_called_once()
-
-    @patch("ozerpan_ercom_sync.custom_api.api.frappe")
-    @patch("ozerpan_ercom_sync.custom_api.api.bulk_update_operation_status")
-    @patch("ozerpan_ercom_sync.custom_api.api._complete_job_with_time_logs")
-    @patch("ozerpan_ercom_sync.custom_api.api.is_job_fully_complete")
-    @patch("ozerpan_ercom_sync.custom_api.api.submit_job_card")
-    @patch("ozerpan_ercom_sync.custom_api.api.update_job_card_status")
-    @patch("ozerpan_ercom_sync.custom_api.api.save_with_retry")
-    @patch("ozerpan_ercom_sync.custom_api.api.read_barcode")
-    def test_complete_operations_job_not_fully_complete(
-        self,
-        mock_read_barcode,
-        mock_save_with_retry,
-        mock_update_job_card_status,
-        mock_submit_job_card,
-        mock_is_job_fully_complete,
-        mock_complete_job_with_time_logs,
-        mock_bulk_update_operation_status,
-        mock_frappe,
-    ):
-        """Test completing operations when job is not fully complete"""
-
-        # Mock unfinished operations response
-        unfinished_ops_result = {
-            "status": "error",
-            "error_type": "unfinished operations",
-            "unfinished_operations": [
-                {
-                    "name": "Kaynak",
-                    "job_card": "JOB-001",
-                    "status": "Work In Progress",
-                    "is_corrective": False,
-                }
-            ],
-        }
-
-        success_result = {"status": "completed", "message": "Quality check completed"}
-        mock_read_barcode.side_effect = [unfinished_ops_result, success_result]
-
-        # Mock job card
-        mock_job_card = Mock()
-        mock_job_card.name = "JOB-001"
-        mock_job_card.docstatus = 0
-        mock_job_card.status = "Work In Progress"
-        mock_job_card.for_quantity = 10
-        mock_job_card.total_completed_qty = 5
-        mock_job_card.time_logs = [Mock(completed_qty=5)]
-        mock_job_card.custom_barcodes = [
-            Mock(
-                barcode="TEST123456",
-                tesdetay_ref="TES-001",
-                status=BarcodeStatus.IN_PROGRESS.value,
-                model="KASA",
-            )
+        self.api_mocks.read_barcode.side_effect = [
+            _UNFINISHED_OPS_MIXED_SUBMISSION,
+            dict(_SUCCESS_RESULT),
         ]
 
-        mock_frappe.get_doc.return_value = mock_job_card
-        mock_is_job_fully_complete.return_value = False  # Job not fully complete
-
-        result = finish_with_previous_operations(
-            barcode=self.mock_barcode,
-            employee=self.mock_employee,
-            operation=self.mock_operation,
+        submitted_job_card = _make_job_card(name=_JOB1, docstatus=1)
+        not_submitted_job_card = _make_job_card(
+            name=_JOB2,
+            status="Completed",
+            total_completed_qty=10,
+            time_logs=[SimpleNamespace(completed_qty=10)],
         )
 
-        # Verify job card was set to "On Hold" instead of submitted
-        mock_update_job_card_status.assert_called_with(mock_job_card, "On Hold")
-        mock_submit_job_card.assert_not_called()
-
-    @patch("ozerpan_ercom_sync.custom_api.api.frappe")
-    @patch("ozerpan_ercom_sync.custom_api.api.read_barcode")
-    def test_missing_job_card_handling(self, mock_read_barcode, mock_frappe):
-        """Test handling of missing job cards"""
-
-        unfinished_ops_result = {
-            "status": "error",
-            "error_type": "unfinished operations",
-            "unfinished_operations": [
-                {
-                    "name": "Kaynak",
-                    "job_card": "MISSING-JOB",
-                    "status": "Missing",
-                    "is_corrective": False,
-                }
-            ],
-        }
-
-        success_result = {"status": "completed", "message": "Quality check completed"}
-        mock_read_barcode.side_effect = [unfinished_ops_result, success_result]
+        self.api_mocks.frappe.get_doc.side_effect = _dict_side_effect(
+            {_JOB1: submitted_job_card, _JOB2: not_submitted_job_card}
+        )
 
-        result = finish_with_previous_operations(
+        result = self.api.finish_with_previous_operations(
             barcode=self.mock_barcode,
             employee=self.mock_employee,
             operation=self.mock_operation,
         )
 
-        # Should still succeed even with missing job cards
+        # Verify that only the non-submitted job card was processed
         self.assertEqual(result["status"], "completed")
-        self.assertIn("completed_previous_operations", result)
-        # Should be empty since missing job card was skipped
-        self.assertEqual(len(result["completed_previous_operations"]), 0)
-
-    @patch("ozerpan_ercom_sync.custom_api.api.frappe")
-    @patch("ozerpan_ercom_sync.custom_api.api.read_barcode")
-    def test_already_submitted_job_card(self, mock_read_barcode, mock_frappe):
-        """Test handling of already submitted job cards"""
-
-        unfinished_ops_result = {
-            "status": "error",
-            "error_type": "unfinished operations",
-            "unfinished_operations": [
-                {
-                    "name": "Kaynak",
-                    "job_card": "JOB-001",
-                    "status": "Completed",
-                    "is_corrective": False,
-                }
-            ],
-        }
-
-        success_result = {"status": "completed", "message": "Quality check completed"}
-        mock_read_barcode.side_effect = [unfinished_ops_result, success_result]
 
-        # Mock already submitted job card
-        mock_job_card = Mock()
-        mock_job_card.name = "JOB-001"
-        mock_job_card.docstatus = 1  # Submitted
-        mock_frappe.get_doc.return_value = mock_job_card
+        # Only one operation should be processed
+        completed_ops = result.get("completed_previous_operations", [])
+        self.assertEqual(len(completed_ops), 1)
 
-        result = finish_with_previous_operations(
-            barcode=self.mock_barcode,
-            employee=self.mock_employee,
-            operation=self.mock_operation,
-        )
+        # Should only process JOB-002 (not submitted), skip JOB-001 (already submitted)
+        processed_job = completed_ops[0]["job_card"]
+        self.assertEqual(processed_job, _JOB2)
 
-        # Should succeed and skip the already submitted job card
-        self.assertEqual(result["status"], "completed")
-        self.assertEqual(len(result["completed_previous_operations"]), 0)
+        # Verify functions were called for the non-submitted job card
+        self.api_mocks._complete_job_with_time_logs.assert_called_once()
+        self.api_mocks.submit_job_card.assert_called_once()
 
-    @patch("ozerpan_ercom_sync.custom_api.api.frappe")
-    @patch("ozerpan_ercom_sync.custom_api.api.read_barcode")
-    def test_exception_handling(self, mock_read_barcode, mock_frappe):
+    def test_exception_handling(self):
         """Test exception handling during operation completion"""
 
         # Mock read_barcode to raise an exception
-        mock_read_barcode.side_effect = Exception("Database connection failed")
-
-        result = finish_with_previous_operations(
-            barcode=self.mock_barcode,
-            employee=self.mock_employee,
-            operation=self.mock_operation,
+        self.api_mocks.read_barcode.side_effect = Exception(
+            "Database connection failed"
         )
 
-        self.assertEqual(result["status"], "error")
-        self.assertEqual(result["error_type"], "system_error")
+        # Only frappe.db is touched on this path, so skip the recursive mock
+        lean_frappe = SimpleNamespace(db=Mock(spec=["commit", "rollback"]))
+        with patch.object(self.api, "frappe", lean_frappe):
+            result = self.api.finish_with_previous_operations(
+                barcode=self.mock_barcode,
+                employee=self.mock_employee,
+                operation=self.mock_operation,
+            )
+
+        expected = {"status": "error", "error_type": "system_error"}
+        self.assertLessEqual(expected.items(), result.items())
         self.assertIn("Failed to complete previous operations", result["message"])
-        mock_frappe.db.rollback.assert_called_once()
+        lean_frappe.db.rollback.assert_called_once()
 
-    @patch("ozerpan_ercom_sync.custom_api.api.frappe")
-    @patch("ozerpan_ercom_sync.custom_api.api.read_barcode")
-    def test_quality_operation_fails_after_completion(
-        self, mock_read_barcode, mock_frappe
-    ):
+    def test_quality_operation_fails_after_completion(self):
         """Test when quality operation fails after completing previous operations"""
 
-        unfinished_ops_result = {
-            "status": "error",
-            "error_type": "unfinished operations",
-            "unfinished_operations": [
-                {
-                    "name": "Kaynak",
-                    "job_card": "JOB-001",
-                    "status": "Work In Progress",
-                    "is_corrective": False,
-                }
-            ],
-        }
-
         # First call returns unfinished operations, second call raises exception
-        mock_read_barcode.side_effect = [
-            unfinished_ops_result,
+        self.api_mocks.read_barcode.side_effect = [
+            _UNFINISHED_OPS_KAYNAK_WIP,
             Exception("Quality operation failed"),
         ]
 
-        # Mock empty job card to complete quickly
-        mock_job_card = Mock()
-        mock_job_card.name = "JOB-001"
-        mock_job_card.docstatus = 0
-        mock_job_card.custom_barcodes = []  # No barcodes to process
-        mock_frappe.get_doc.return_value = mock_job_card
+        # Empty job card to complete quickly, no barcodes to process
+        mock_job_card = _make_job_card()
+        self.api_mocks.frappe.get_doc.return_value = mock_job_card
 
-        result = finish_with_previous_operations(
+        result = self.api.finish_with_previous_operations(
             barcode=self.mock_barcode,
             employee=self.mock_employee,
             operation=self.mock_operation,
         )
 
-        self.assertEqual(result["status"], "error")
-        self.assertEqual(result["error_type"], "quality_operation")
+        expected = {"status": "error", "error_type": "quality_operation"}
+        self.assertLessEqual(expected.items(), result.items())
         self.assertIn("Previous operations completed successfully", result["message"])
 
-    def test_time_log_completion_function(self):
-        """Test the _complete_job_with_time_logs function directly"""
-        with patch("ozerpan_ercom_sync.custom_api.api.frappe") as mock_frappe:
-            mock_frappe.utils.now.return_value = "2024-01-01 10:00:00"
-            mock_frappe.utils.get_datetime.side_effect = lambda x: x
+    def test_time_log_completion(self):
+        """Test _complete_job_with_time_logs with and without an open time log"""
+        self.api_mocks.frappe.utils.now.return_value = "2024-01-01 10:00:00"
+        self.api_mocks.frappe.utils.get_datetime.side_effect = lambda x: x
 
-            # Test with open time log
-            mock_job_card = Mock()
-            mock_job_card.name = "JOB-001"
-            mock_job_card.for_quantity = 10
-            mock_job_card.total_completed_qty = 5
+        with self.subTest("open_log"):
+            mock_job_card = _make_job_card(total_completed_qty=5)
 
             # Mock open time log
             open_time_log = Mock()
@@ -362,25 +437,21 @@ class TestFinishWithPreviousOperations(unittest.TestCase):
 
             mock_job_card.time_logs = [open_time_log]
 
-            _complete_job_with_time_logs(mock_job_card, "EMP001")
+            self.complete_job_with_time_logs(mock_job_card, self.mock_employee)
 
             # Verify open time log was closed
             self.assertIsNotNone(open_time_log.to_time)
             self.assertEqual(open_time_log.completed_qty, 5)  # remaining quantity
 
-    def test_time_log_completion_no_open_logs(self):
-        """Test _complete_job_with_time_logs when no open time logs exist"""
-        with patch("ozerpan_ercom_sync.custom_api.api.frappe") as mock_frappe:
-            mock_frappe.utils.now.return_value = "2024-01-01 10:00:00"
-
+        with self.subTest("no_logs"):
             mock_job_card = Mock()
-            mock_job_card.name = "JOB-001"
+            mock_job_card.name = _JOB_NAME
             mock_job_card.for_quantity = 10
             mock_job_card.total_completed_qty = 0
             mock_job_card.time_logs = []  # No existing logs
             mock_job_card.append = Mock()
 
-            _complete_job_with_time_logs(mock_job_card, "EMP001")
+            self.complete_job_with_time_logs(mock_job_card, self.mock_employee)
 
             # Verify new time log was created
             mock_job_card.append.assert_called_once_with(
@@ -388,65 +459,12 @@ class TestFinishWithPreviousOperations(unittest.TestCase):
                 {
                     "from_time": "2024-01-01 10:00:00",
                     "to_time": "2024-01-01 10:00:00",
-                    "employee": "EMP001",
+                    "employee": self.mock_employee,
                     "completed_qty": 10,
                     "time_in_mins": 0,
                 },
             )
 
-    @patch("ozerpan_ercom_sync.custom_api.api.frappe")
-    @patch("ozerpan_ercom_sync.custom_api.api.read_barcode")
-    def test_job_card_submission_after_completion(self, mock_read_barcode, mock_frappe):
-        """Test that job cards are properly submitted after completion"""
-
-        unfinished_ops_result = {
-            "status": "error",
-            "error_type": "unfinished operations",
-            "unfinished_operations": [
-                {
-                    "name": "Kaynak",
-                    "job_card": "JOB-001",
-                    "status": "Work In Progress",
-                    "is_corrective": False,
-                }
-            ],
-        }
-
-        success_result = {"status": "completed", "message": "Quality check completed"}
-        mock_read_barcode.side_effect = [unfinished_ops_result, success_result]
-
-        # Mock job card with time logs that show completion
-        mock_job_card = Mock()
-        mock_job_card.name = "JOB-001"
-        mock_job_card.docstatus = 0
-        mock_job_card.status = "Work In Progress"
-        mock_job_card.for_quantity = 10
-        mock_job_card.total_completed_qty = 10
-        mock_job_card.time_logs = [Mock(completed_qty=10)]
-        mock_job_card.custom_barcodes = []  # No barcodes to process
-
-        mock_frappe.get_doc.return_value = mock_job_card
-
-        with patch(
-            "ozerpan_ercom_sync.custom_api.api._complete_job_with_time_logs"
-        ) as mock_complete:
-            with patch(
-                "ozerpan_ercom_sync.custom_api.api.submit_job_card"
-            ) as mock_submit:
-                with patch(
-                    "ozerpan_ercom_sync.custom_api.api.save_with_retry"
-                ) as mock_save:
-                    result = finish_with_previous_operations(
-                        barcode=self.mock_barcode,
-                        employee=self.mock_employee,
-                        operation=self.mock_operation,
-                    )
-
-                    # Verify job card was completed and submitted
-                    mock_complete.assert_called_once()
-                    mock_submit.assert_called_once()
-                    self.assertEqual(result["status"], "completed")
-
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from ozerpan_ercom_sync.custom_api.barcode_reader.utils import get_poz_data
+
+
+def _bom_item(item_code, qty):
+    return SimpleNamespace(
+        item_code=item_code, item_name=f"{item_code} name", qty=qty, image=None
+    )
+
+
+class TestGetPozData(unittest.TestCase):
+    """Run get_poz_data end to end against a patched frappe"""
+
+    def setUp(self):
+        patcher = patch.object(get_poz_data, "frappe")
+        self.mock_frappe = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tesdetay = {
+            "siparis_no": "S-001",
+            "poz_no": 3,
+            "sanal_adet": 1,
+            "bayi_adi": "Bayi",
+            "musteri": "Musteri",
+        }
+        self.bom = SimpleNamespace(
+            items=[_bom_item("PRF-1", 2), _bom_item("CAM-1", 1)],
+            custom_accessory_kits=[],
+            get={"quantity": 5}.get,
+        )
+        docs = {
+            ("TesDetay", "TD-1"): SimpleNamespace(
+                get=self.tesdetay.get, **self.tesdetay
+            ),
+            ("Sales Order", "S-001"): {"custom_remarks": "Not"},
+            ("BOM", "BOM-S-001-3-002"): self.bom,
+            ("Item", "S-001-3"): {"custom_serial": "SR", "custom_color": "Beyaz"},
+        }
+        self.mock_frappe.get_doc.side_effect = lambda doctype, name: docs[
+            (doctype, name)
+        ]
+
+        def get_all(doctype, **kwargs):
+            if doctype == "BOM":
+                return [SimpleNamespace(name="BOM-S-001-3-002")]
+            return [("PRF-1", "PVC Hat1 Ana Profiller"), ("CAM-1", "Camlar")]
+
+        self.mock_frappe.get_all.side_effect = get_all
+
+    def test_groups_latest_default_bom(self):
+        data = get_poz_data.get_poz_data("TEST123456", tesdetay_name="TD-1")
+
+        bom_query = self.mock_frappe.get_all.call_args_list[0]
+        self.assertEqual(bom_query.args, ("BOM",))
+        self.assertEqual(
+            bom_query.kwargs["filters"],
+            {"name": ["like", "BOM-S-001-3%"], "is_default": 1, "is_active": 1},
+        )
+        self.assertEqual(data["max_sanal_adet"], 5)
+        self.assertEqual(data["color"], "Beyaz")
+        self.assertEqual(data["remarks"], "Not")
+        self.assertEqual(
+            {
+                group: [i["item_code"] for i in items]
+                for group, items in data["items"].items()
+            },
+            {"ana_profil": ["PRF-1"], "cam_unite": ["CAM-1"]},
+        )
+
+    def test_missing_default_bom_throws(self):
+        self.mock_frappe.get_all.side_effect = None
+        self.mock_frappe.get_all.return_value = []
+        self.mock_frappe.throw.side_effect = Exception("no bom")
+
+        with self.assertRaisesRegex(Exception, "no bom"):
+            get_poz_data.get_poz_data("TEST123456", tesdetay_name="TD-1")
+
+        self.mock_frappe.throw.assert_called_once_with(
+            "No active default BOM found for BOM-S-001-3"
+        )
@@ -0,0 +1,200 @@
+import unittest
+from unittest.mock import DEFAULT, patch
+
+from ozerpan_ercom_sync import utils
+
+_NOW = "2026-01-01 10:00:00.000000"
+_USER = "test@example.com"
+
+
+class TestBulkChildRows(unittest.TestCase):
+    """Check the SQL and params the bulk child-table helpers send to frappe.db"""
+
+    def setUp(self):
+        patcher = patch.multiple(utils, frappe=DEFAULT, now=DEFAULT)
+        mocks = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_frappe = mocks["frappe"]
+        mocks["now"].return_value = _NOW
+        self.mock_frappe.session.user = _USER
+
+    def sql_calls(self):
+        """(normalized sql, params) for each frappe.db.sql call"""
+        return [
+            (" ".join(c.args[0].split()), c.args[1])
+            for c in self.mock_frappe.db.sql.call_args_list
+        ]
+
+    def test_insert_plain_rows(self):
+        rows = [
+            {"parent": "TD-1", "job_card_ref": "JC-1", "status": "Pending"},
+            {"parent": "TD-2", "job_card_ref": "JC-1"},
+        ]
+
+        inserted = utils.bulk_insert_child_rows(
+            "TesDetay Operation Status",
+            "TesDetay",
+            "operation_states",
+            rows,
+            extra_fields=["job_card_ref", "status"],
+        )
+
+        [(sql, params)] = self.sql_calls()
+        self.assertEqual(
+            sql,
+            "INSERT INTO `tabTesDetay Operation Status` (`name`, `parentfield`, "
+            "`parent`, `parenttype`, `creation`, `owner`, `modified`, "
+            "`modified_by`, `job_card_ref`, `status`) VALUES "
+            "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s), "
+            "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+        )
+        self.assertEqual(
+            params,
+            (inserted[0]["name"], "operation_states", "TD-1", "TesDetay")
+            + (_NOW, _USER, _NOW, _USER, "JC-1", "Pending")
+            + (inserted[1]["name"], "operation_states", "TD-2", "TesDetay")
+            + (_NOW, _USER, _NOW, _USER, "JC-1", None),
+        )
+        self.assertEqual([i["parent"] for i in inserted], ["TD-1", "TD-2"])
+
+    def test_insert_names_are_full_length_hashes(self):
+        rows = [{"parent": f"TD-{i}"} for i in range(50)]
+
+        inserted = utils.bulk_insert_child_rows(
+            "CamListe Job Card", "CamListe", "job_cards", rows
+        )
+
+        names = [item["name"] for item in inserted]
+        self.assertEqual(len(set(names)), len(rows))
+        for name in names:
+            self.assertRegex(name, "^[0-9a-f]{56}$")
+
+    def test_insert_in_batches(self):
+        rows = [{"parent": parent} for parent in ("TD-2", "TD-1", "TD-3")]
+
+        inserted = utils.bulk_insert_child_rows(
+            "CamListe Job Card", "CamListe", "job_cards", rows, batch_size=2
+        )
+
+        names = {item["parent"]: item["name"] for item in inserted}
+        row_sql = "(%s, %s, %s, %s, %s, %s, %s, %s)"
+        insert_sql = (
+            "INSERT INTO `tabCamListe Job Card` (`name`, `parentfield`, `parent`, "
+            "`parenttype`, `creation`, `owner`, `modified`, `modified_by`) VALUES "
+        )
+
+        def row_params(parent):
+            audit = (_NOW, _USER, _NOW, _USER)
+            return (names[parent], "job_cards", parent, "CamListe") + audit
+
+        # Rows are grouped by parent before they are split into batches
+        self.assertEqual(
+            self.sql_calls(),
+            [
+                (
+                    insert_sql + f"{row_sql}, {row_sql}",
+                    row_params("TD-1") + row_params("TD-2"),
+                ),
+                (insert_sql + row_sql, row_params("TD-3")),
+            ],
+        )
+
+    def test_insert_nothing(self):
+        self.assertEqual(
+            utils.bulk_insert_child_rows("CamListe Job Card", "CamListe", "x", []),
+            [],
+        )
+        self.mock_frappe.db.sql.assert_not_called()
+
+    def test_delete_in_batches(self):
+        utils.bulk_delete_child_rows(
+            "TesDetay Operation Status",
+            "job_card_ref",
+            ["JC-1", "JC-2", "JC-3"],
+            batch_size=2,
+        )
+
+        delete_sql = (
+            "DELETE FROM `tabTesDetay Operation Status` WHERE `job_card_ref` IN "
+        )
+        self.assertEqual(
+            self.sql_calls(),
+            [
+                (delete_sql + "(%s, %s)", ("JC-1", "JC-2")),
+                (delete_sql + "(%s)", ("JC-3",)),
+            ],
+        )
+
+    def test_delete_nothing(self):
+        utils.bulk_delete_child_rows("CamListe Job Card", "job_card_ref", [])
+        self.mock_frappe.db.sql.assert_not_called()
+
+    def test_update_status_in_batches(self):
+        utils.bulk_update_operation_status(
+            ["TD-1", "TD-2", "TD-1", "TD-3"],
+            ["JC-1", "JC-1", "JC-1", "JC-2"],
+            "Completed",
+            batch_size=2,
+        )
+
+        def update_sql(pairs_sql):
+            return (
+                "UPDATE `tabTesDetay Operation Status` t "
+                f"JOIN ({pairs_sql}) u "
+                "ON t.parent = u.parent AND t.job_card_ref = u.job_card_ref "
+                "SET t.status = %s, t.modified = %s, t.modified_by = %s"
+            )
+
+        first_pair = "SELECT %s AS parent, %s AS job_card_ref"
+        set_params = ("Completed", _NOW, _USER)
+        # The repeated (TD-1, JC-1) pair is sent once
+        self.assertEqual(
+            self.sql_calls(),
+            [
+                (
+                    update_sql(f"{first_pair} UNION ALL SELECT %s, %s"),
+                    ("TD-1", "JC-1", "TD-2", "JC-1") + set_params,
+                ),
+                (update_sql(first_pair), ("TD-3", "JC-2") + set_params),
+            ],
+        )
+
+    def test_update_status_nothing(self):
+        utils.bulk_update_operation_status([], ["JC-1"], "Completed")
+        self.mock_frappe.db.sql.assert_not_called()
+
+
+class TestGetMysqlConnection(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.multiple(utils, frappe=DEFAULT, pymysql=DEFAULT)
+        mocks = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_frappe = mocks["frappe"]
+        self.mock_pymysql = mocks["pymysql"]
+        self.mock_frappe.local.site = "test.site"
+        self.mock_frappe.conf = {
+            "ercom_db_host": "ercom",
+            "ercom_db_name": "ercom_db",
+            "ercom_db_user": "ercom_user",
+            "ercom_db_password": "secret",
+        }
+        patcher = patch.object(utils, "_ercom_connections", utils.threading.local())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reuses_autocommit_connection(self):
+        with utils.get_mysql_connection() as first:
+            pass
+        with utils.get_mysql_connection() as second:
+            pass
+
+        self.assertIs(first, second)
+        self.mock_pymysql.connect.assert_called_once()
+        self.assertTrue(self.mock_pymysql.connect.call_args.kwargs["autocommit"])
+        first.close.assert_not_called()
+        second.ping.assert_called_once_with(reconnect=True)
+
+    def test_body_errors_are_not_wrapped(self):
+        with self.assertRaises(KeyError):
+            with utils.get_mysql_connection():
+                raise KeyError("MAKINA")
@@ -1,49 +1,67 @@
+import os
+import threading
 import time
-from functools import wraps
+from contextlib import contextmanager
+from functools import lru_cache, wraps
 from typing import Dict, List
 
 import frappe
 import pymysql
-from frappe import generate_hash
 from frappe.utils import now
 
 
 def timer(func):
+    """Log how long func took, when enable_timer_logs is set in site config"""
+
     @wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        if not frappe.conf.get("enable_timer_logs"):
+            return func(*args, **kwargs)
+
+        start_time = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        end_time = time.time()
-        execution_time = (end_time - start_time) * 1000
-        print(f"Function '{func.__name__}' took {execution_time:.2f} ms to execute")
+        execution_time = (time.perf_counter_ns() - start_time) / 1e6
+        frappe.logger("ercom_sync").info(
+            f"Function '{func.__name__}' took {execution_time:.2f} ms to execute"
+        )
         return result
 
     return wrapper
 
 
+# ercom connections by site, kept open for the life of the thread
+_ercom_connections = threading.local()
+
+
 # TODO refactor the dependant functions and clear this.
+@contextmanager
 def get_mysql_connection():
-    config = frappe.conf
+    """
+    Connect to the ercom database.
 
-    try:
-        # Create a connection to the MySQL database using pymysql
+    Use it as a context manager. The connection stays open for the next call
+    in the same thread instead of being closed, so later calls skip the TCP
+    and auth handshake; the ping on entry reopens it if it was dropped. It
+    runs in autocommit mode, so each query sees the current ercom data.
+    """
+    site = frappe.local.site
+    connection = getattr(_ercom_connections, site, None)
+    if connection is None:
+        config = frappe.conf
         connection = pymysql.connect(
             host=config["ercom_db_host"],
-            database=config["ercom_db_name"],  # pymysql uses "db" instead of "database"
+            database=config["ercom_db_name"],
             user=config["ercom_db_user"],
             password=config["ercom_db_password"],
-            charset="utf8mb4",  # Optional: Ensure proper encoding
-            cursorclass=pymysql.cursors.DictCursor,  # Optional: Return rows as dictionaries
+            charset="utf8mb4",
+            cursorclass=pymysql.cursors.DictCursor,
+            autocommit=True,
         )
-        print("\n\n\nConnected to DB Successfully.\n\n\n")
-    except pymysql.MySQLError as err:
-        print(f"Error connecting to MySQL database: {err}")
-        return None
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        return None
+        setattr(_ercom_connections, site, connection)
+    else:
+        connection.ping(reconnect=True)
 
-    return connection
+    yield connection
 
 
 def bulk_insert_child_rows(
@@ -52,6 +70,7 @@ def bulk_insert_child_rows(
     parentfield: str,
     rows: List[Dict],
     extra_fields=None,
+    batch_size: int = 2000,
 ) -> List[Dict]:
     """
     Bulk insert into a child table using raw SQL.
@@ -62,11 +81,12 @@ def bulk_insert_child_rows(
         parentfield (str): The table field in parent (e.g., "operation_states")
         rows (list of dict): Each dict must have a `parent` key, plus other required fields
         extra_fields (list): Optional extra field names to include in insert
+        batch_size (int): Rows per INSERT statement, keeps each statement
+            below the server's max_allowed_packet
 
     Returns:
         List[str]: Names of all inserted rows
     """
-
     if not rows:
         return []
 
@@ -87,94 +107,117 @@ def bulk_insert_child_rows(
     if extra_fields:
         fields.extend(extra_fields)
 
+    # Same timestamp and user for every row; build each tuple in `fields` order
+    ts = now()
+    user = frappe.session.user
+    extra_fields = extra_fields or ()
+    # 56 hex character names, the length of generate_hash() with no args, so
+    # collisions stay as unlikely as with the per-row calls (a raw multi-row
+    # INSERT has no retry on a duplicate name). One urandom call for all rows.
+    randbuf = os.urandom(28 * len(rows))
+
     for i, row in enumerate(rows):
-        name = generate_hash()
-        parent_name = row["parent"]
-        inserted_items.append({"name": name, "parent": parent_name})
-        base = {
-            "name": name,
-            "parentfield": parentfield,
-            "parent": parent_name,
-            "parenttype": parenttype,
-            "creation": now(),
-            "owner": frappe.session.user,
-            "modified": now(),
-            "modified_by": frappe.session.user,
-        }
-
-        if extra_fields:
-            for field in extra_fields:
-                base[field] = row.get(field)
-
-        values.append(tuple(base[f] for f in fields))
-
-    placeholders = ", ".join(["%s"] * len(values))
+        name = randbuf[i * 28 : i * 28 + 28].hex()
+        inserted_items.append({"name": name, "parent": row["parent"]})
+        values.append(
+            (name, parentfield, row["parent"], parenttype, ts, user, ts, user)
+            + tuple(row.get(field) for field in extra_fields)
+        )
+
+    # Group rows by parent so each batch touches neighbouring index pages
+    values.sort(key=lambda value: value[2] or "")
+
+    # All batches run in the caller's transaction, so they commit together
+    fields = tuple(fields)
+    for start in range(0, len(values), batch_size):
+        batch = values[start : start + batch_size]
+        sql = _make_insert_sql(child_table, fields, len(batch))
+        params = tuple(v for row in batch for v in row)
+        frappe.db.sql(sql, params)
+
+    return inserted_items
+
+
+@lru_cache(maxsize=64)
+def _make_insert_sql(child_table, fields, batch_len):
+    """Build the INSERT for batch_len rows; every full batch reuses the same text"""
+    # One "(%s, ...)" group per row, with the row values flattened to match
+    row_placeholder = "(" + ", ".join(["%s"] * len(fields)) + ")"
     fields_sql = ", ".join([f"`{f}`" for f in fields])
-    sql = f"""
+    placeholders = ", ".join([row_placeholder] * batch_len)
+    return f"""
         INSERT INTO `tab{child_table}` ({fields_sql})
         VALUES {placeholders}
     """
 
-    frappe.db.sql(sql, tuple(values))
-
-    return inserted_items
 
-
-def bulk_delete_child_rows(child_table, parent_field, references):
+def bulk_delete_child_rows(child_table, parent_field, references, batch_size=1000):
     """
     Bulk delete from a child table using raw SQL.
 
+    Expects an index on parent_field; job_card_ref is a search_index field on
+    both TesDetay Operation Status and CamListe Job Card.
+
     Args:
             child_table (str): The child DocType name (e.g., "TesDetay Operation Status")
             parent_field (str): The field to match for deletion (e.g., "job_card_ref")
             references (list): List of values to match against parent field
+            batch_size (int): References per DELETE statement
     """
 
     if not references:
         return
 
-    placeholders = ", ".join(["%s"] * len(references))
-    sql = f"""
-        DELETE FROM `tab{child_table}`
-        WHERE `{parent_field}` IN ({placeholders})
-    """
+    # Keep each IN list short instead of loading the references into a
+    # temporary table: frappe refuses CREATE inside a transaction with writes
+    references = list(references)
+    for start in range(0, len(references), batch_size):
+        batch = references[start : start + batch_size]
+        placeholders = ", ".join(["%s"] * len(batch))
+        sql = f"""
+            DELETE FROM `tab{child_table}`
+            WHERE `{parent_field}` IN ({placeholders})
+        """
 
-    frappe.db.sql(sql, tuple(references))
+        frappe.db.sql(sql, tuple(batch))
 
 
-def bulk_update_operation_status(tesdetay_refs, job_card_refs, status):
+def bulk_update_operation_status(tesdetay_refs, job_card_refs, status, batch_size=2000):
     """
     Bulk update operation states using raw SQL
 
+    Expects an index on (parent, job_card_ref), added by on_doctype_update in
+    tesdetay_operation_status.py.
+
     Args:
         tesdetay_refs (list): List of tesdetay references
         job_card_refs (list): List of job card references
         status (str): Status to set
+        batch_size (int): (tesdetay_ref, job_card_ref) pairs per UPDATE statement
     """
     if not tesdetay_refs or not job_card_refs:
         return
 
-    # Create pairs of tesdetay_ref and job_card_ref
-    pairs = list(zip(tesdetay_refs, job_card_refs))
-
-    # Create CASE statement conditions
-    case_conditions = []
-    values = []
-    for tesdetay_ref, job_card_ref in pairs:
-        case_conditions.append(
-            "(parent = %s AND job_card_ref = %s)",
+    # Unique pairs of tesdetay_ref and job_card_ref
+    pairs = list(dict.fromkeys(zip(tesdetay_refs, job_card_refs)))
+    modified = now()
+    user = frappe.session.user
+
+    # Join the pairs in as a derived table so they are matched through the
+    # parent index instead of a growing OR chain. A temporary table would need
+    # CREATE, which frappe refuses inside a transaction that has writes.
+    for start in range(0, len(pairs), batch_size):
+        batch = pairs[start : start + batch_size]
+        pairs_sql = " UNION ALL ".join(
+            ["SELECT %s AS parent, %s AS job_card_ref"]
+            + ["SELECT %s, %s"] * (len(batch) - 1)
         )
-        values.extend([tesdetay_ref, job_card_ref])
-
-    where_clause = " OR ".join(case_conditions)
-
-    sql = f"""
-        UPDATE `tabTesDetay Operation Status`
-        SET status = %s, modified = %s, modified_by = %s
-        WHERE {where_clause}
-    """
-
-    values.insert(0, status)
-    values.insert(1, now())
-    values.insert(2, frappe.session.user)
-    frappe.db.sql(sql, tuple(values))
+        sql = f"""
+            UPDATE `tabTesDetay Operation Status` t
+            JOIN ({pairs_sql}) u
+                ON t.parent = u.parent AND t.job_card_ref = u.job_card_ref
+            SET t.status = %s, t.modified = %s, t.modified_by = %s
+        """
+
+        params = tuple(v for pair in batch for v in pair) + (status, modified, user)
+        frappe.db.sql(sql, params)